@@ -1,5 +1,28 @@
 #!/bin/bash
-for i in {1..12}; do
-  /coin-forge/health-script.sh
-  sleep 5
-done
\ No newline at end of file
+# Run the health check every 5 seconds for one minute (cron starts us each minute)
+INTERVAL=5
+RUNS=12
+
+# Skip this minute only if the previous wrapper is still running well past its
+# minute; the short wait absorbs normal end-of-minute jitter
+if command -v flock > /dev/null; then
+  exec 9> /coin-forge/health-script.lock
+  flock -w 10 9 || exit 0
+fi
+
+# Stop between runs on INT/TERM instead of waiting out the sleep
+trap 'exit 0' INT TERM
+
+# Slots are offsets from the wrapper's start, so per-run jitter doesn't accumulate
+for ((i = 0; i < RUNS; i++)); do
+  # Close the lock fd so nothing the health check spawns keeps holding the lock
+  /coin-forge/health-script.sh 9>&-
+  # No sleep after the final run, so the lock is released before the next minute
+  if ((i < RUNS - 1)); then
+    REMAINING=$(((i + 1) * INTERVAL - SECONDS))
+    if ((REMAINING > 0)); then
+      sleep "$REMAINING" &
+      wait $!
+    fi
+  fi
+done
@@ -1,17 +1,21 @@
 #!/bin/bash
 
+# File locations
+LOG_FILE="/coin-forge/health-script.log"
+CFG_FILE="/coin-forge/cfg.json"
+
 # Ensure logging directory exists
 mkdir -p /coin-forge
 
-# Log function for better readability
-log() { echo "$(date +'%Y-%m-%d %H:%M:%S') - $1" >> /coin-forge/health-script.log; }
+# Log function for better readability; printf's %(...)T formats the timestamp
+# in-process instead of forking date for every line
+log() { printf '%(%Y-%m-%d %H:%M:%S)T - %s\n' -1 "$1" >> "$LOG_FILE"; }
 
 log "---- Script started ----"
 
 set -euo pipefail
 
 # Log file configuration
-LOG_FILE="/coin-forge/health-script.log"
 MAX_LOG_SIZE=$((5 * 1024 * 1024))  # 5 MB
 
 # Check if the log file exceeds the maximum size and handle it
@@ -21,20 +25,38 @@ if [[ -f "$LOG_FILE" && $(stat -c%s "$LOG_FILE") -gt $MAX_LOG_SIZE ]]; then
     touch "$LOG_FILE"
 fi
 
+# Bound every curl call so a hung endpoint cannot stall the 5s cron cadence
+# (curl never follows redirects unless asked, so no extra round trips there)
+CURL_TIMEOUTS=(--connect-timeout 3 --max-time 5)
+
 # Check if cfg.json exists
-if [[ ! -f "/coin-forge/cfg.json" ]]; then
+if [[ ! -f "$CFG_FILE" ]]; then
     log "Error: cfg.json file not found."
     exit 1
 fi
 
-# Parse cfg.json without jq (safe assignments)
+# Parse cfg.json without jq in a single awk pass (safe assignments)
+# DEVICE_IP and PRIMARY_IF are optional per-host overrides; when unset they
+# are detected from the default route below
 CONTROLLER_IP=""
 TARGET_URL=""
 DEVICE_HOSTNAME=""
+DEVICE_IP=""
+PRIMARY_IF=""
 
-CONTROLLER_IP=$(grep '"CONTROLLER_IP"' /coin-forge/cfg.json | awk -F'"' '{print $4}') || CONTROLLER_IP=""
-TARGET_URL=$(grep '"TARGET_URL"' /coin-forge/cfg.json | awk -F'"' '{print $4}') || TARGET_URL=""
-DEVICE_HOSTNAME=$(grep '"COIN_FORGE_HOST"' /coin-forge/cfg.json | awk -F'"' '{print $4}') || DEVICE_HOSTNAME=""
+{
+    read -r CONTROLLER_IP
+    read -r TARGET_URL
+    read -r DEVICE_HOSTNAME
+    read -r DEVICE_IP
+    read -r PRIMARY_IF
+} < <(awk -F'"' '
+    $2 == "CONTROLLER_IP" {controller = $4}
+    $2 == "TARGET_URL" {target = $4}
+    $2 == "COIN_FORGE_HOST" {host = $4}
+    $2 == "DEVICE_IP" {ip = $4}
+    $2 == "PRIMARY_IF" {iface = $4}
+    END {print controller; print target; print host; print ip; print iface}' "$CFG_FILE") || true
 
 log "CONTROLLER_IP: ${CONTROLLER_IP:-}"
 log "TARGET_URL: ${TARGET_URL:-}"
@@ -50,38 +72,69 @@ if [[ -z "${DEVICE_HOSTNAME:-}" ]]; then
     log "DEVICE_HOSTNAME not found in cfg.json, using system hostname: $DEVICE_HOSTNAME"
 fi
 
-# Get primary IP address (IPv4, non-loopback)
-DEVICE_IP="10.1.100.20"
-
-# Get primary interface name
-PRIMARY_IF="eth0"
-
+# Start the reachability check in the background so it overlaps metric collection
+log "Testing reachability of $TARGET_URL..."
+curl --silent --head "${CURL_TIMEOUTS[@]}" "$TARGET_URL" --insecure > /dev/null &
+REACHABILITY_PID=$!
+# Don't leave it running (holding inherited fds) if the script exits early
+trap 'kill "$REACHABILITY_PID" 2>/dev/null || true' EXIT
+
+# Get primary interface name: cfg.json, otherwise the default route
+if [[ -z "${PRIMARY_IF:-}" ]]; then
+    PRIMARY_IF=$(ip route 2>/dev/null | awk '/default/ {print $5; exit}') || PRIMARY_IF=""
+fi
+log "PRIMARY_IF: ${PRIMARY_IF:-}"
+if [[ -z "${PRIMARY_IF:-}" ]]; then
+    log "Error: Unable to determine PRIMARY_IF."
+    exit 1
+fi
 
-# Get current CPU utilization (percentage, last 1 min)
-CPU_LINE=""
-CPU_IDLE=""
-CPU_UTIL=""
-CPU_LINE=$(top -bn2 | grep "Cpu(s)" | tail -n 1) || CPU_LINE=""
-CPU_IDLE=$(echo "$CPU_LINE" | awk '{for(i=1;i<=NF;i++) if ($i ~ /id,/) print $(i-1)}' | sed 's/,//') || CPU_IDLE=""
-if [[ -z "${CPU_IDLE:-}" ]]; then
-    CPU_IDLE=$(echo "$CPU_LINE" | awk '{print $8}') || CPU_IDLE="0.0"
+# Get primary IP address (IPv4) of that interface: cfg.json, otherwise ip addr,
+# otherwise ifconfig (both the "inet addr:X" and "inet X" output formats)
+if [[ -z "${DEVICE_IP:-}" ]]; then
+    DEVICE_IP=$(ip -4 -o addr show dev "$PRIMARY_IF" 2>/dev/null | awk '{split($4, a, "/"); print a[1]; exit}') || DEVICE_IP=""
+fi
+if [[ -z "${DEVICE_IP:-}" ]]; then
+    DEVICE_IP=$(ifconfig "$PRIMARY_IF" 2>/dev/null | awk '$1 == "inet" {sub(/^addr:/, "", $2); print $2; exit}') || DEVICE_IP=""
+fi
+log "DEVICE_IP: ${DEVICE_IP:-}"
+if [[ -z "${DEVICE_IP:-}" ]]; then
+    log "Error: Unable to determine DEVICE_IP."
+    exit 1
 fi
-CPU_UTIL=$(awk -v idle="${CPU_IDLE:-0.0}" 'BEGIN {printf "%.1f", 100 - idle}') || CPU_UTIL="0.0"
+
+# Get current CPU utilization (percentage) from two /proc/stat samples taken
+# 1s apart; one awk pass turns the deltas into both utilization and idle
+CPU_SAMPLE_1=""
+CPU_SAMPLE_2=""
+CPU_SAMPLE_1=$(awk '/^cpu / {print $2, $3, $4, $5, $6, $7, $8, $9; exit}' /proc/stat) || CPU_SAMPLE_1=""
+sleep 1
+CPU_SAMPLE_2=$(awk '/^cpu / {print $2, $3, $4, $5, $6, $7, $8, $9; exit}' /proc/stat) || CPU_SAMPLE_2=""
+read -r CPU_UTIL CPU_IDLE < <(awk -v a="$CPU_SAMPLE_1" -v b="$CPU_SAMPLE_2" 'BEGIN {
+    n = split(a, s1); split(b, s2)
+    for (i = 1; i <= n; i++) total += s2[i] - s1[i]
+    idle = total > 0 ? 100 * (s2[4] - s1[4]) / total : 100
+    printf "%.1f %.1f\n", 100 - idle, idle
+}') || true
+CPU_UTIL="${CPU_UTIL:-0.0}"
+CPU_IDLE="${CPU_IDLE:-0.0}"
 log "CPU_UTIL: $CPU_UTIL (Idle: $CPU_IDLE)"
 
 # Get current memory usage (used/total in MB)
 MEM_TOTAL=""
 MEM_USED=""
-MEM_TOTAL=$(free -m | awk '/Mem:/ {print $2}') || MEM_TOTAL="0"
-MEM_USED=$(free -m | awk '/Mem:/ {print $3}') || MEM_USED="0"
+# Read both fields from a single free/awk pass
+read -r MEM_TOTAL MEM_USED < <(free -m | awk '/Mem:/ {print $2, $3}') || true
+MEM_TOTAL="${MEM_TOTAL:-0}"
+MEM_USED="${MEM_USED:-0}"
 log "MEM_TOTAL: $MEM_TOTAL"
 log "MEM_USED: $MEM_USED"
 
 # Get total bytes in and out on primary interface
 BYTES_IN=""
 BYTES_OUT=""
-BYTES_IN=$(cat /proc/net/dev | awk -v iface="$PRIMARY_IF" '$1 ~ iface":" {gsub(/:/,"",$1); print $2}') || BYTES_IN="0"
-BYTES_OUT=$(cat /proc/net/dev | awk -v iface="$PRIMARY_IF" '$1 ~ iface":" {gsub(/:/,"",$1); print $10}') || BYTES_OUT="0"
+# Read both counters from a single pass over /proc/net/dev
+read -r BYTES_IN BYTES_OUT < <(awk -v iface="$PRIMARY_IF" '$1 ~ iface":" {gsub(/:/,"",$1); print $2, $10}' /proc/net/dev) || true
 log "BYTES_IN: $BYTES_IN"
 log "BYTES_OUT: $BYTES_OUT"
 
@@ -90,10 +143,9 @@ if [[ -z "${BYTES_IN:-}" || -z "${BYTES_OUT:-}" ]]; then
     exit 1
 fi
 
-# Check reachability
-log "Testing reachability of $TARGET_URL..."
+# Collect the reachability result
 REACHABLE=false
-if curl --silent --head "$TARGET_URL" > /dev/null; then
+if wait "$REACHABILITY_PID"; then
     log "Successfully reached $TARGET_URL. Preparing to send health-check to $CONTROLLER_IP..."
     REACHABLE=true
 else
@@ -124,13 +176,19 @@ HTTP_RESPONSE_BODY=""
 HTTP_STATUS_CODE=""
 HTTP_RESPONSE_TMP=$(mktemp)
 
-# Send POST and capture the HTTP status and body
-HTTP_STATUS_CODE=$(curl --silent --show-error --fail -X POST \
+# Send POST and capture the HTTP status and body; curl retries transient
+# failures (timeouts, refused connections while the controller restarts,
+# HTTP 408, 429, 500, 502, 503, 504) itself but not other errors like 401/403
+# or 501.
+# No --fail here: error responses must reach the status check below instead
+# of aborting the script under set -e with the body discarded.
+HTTP_STATUS_CODE=$(curl --silent --show-error -X POST "${CURL_TIMEOUTS[@]}" \
+    --retry 2 --retry-delay 1 --retry-connrefused \
     -H "Content-Type: application/json" \
     -d "$PAYLOAD" \
     -w "%{http_code}" \
     -o "$HTTP_RESPONSE_TMP" \
-    "$HEALTH_CHECK_URL" 2>>"$LOG_FILE")
+    "$HEALTH_CHECK_URL" 2>>"$LOG_FILE") || HTTP_STATUS_CODE="000"
 
 HTTP_RESPONSE_BODY=$(cat "$HTTP_RESPONSE_TMP")
 rm -f "$HTTP_RESPONSE_TMP"
@@ -143,26 +201,31 @@ if [[ "$HTTP_STATUS_CODE" -ne 200 ]]; then
     exit 1
 fi
 
-# Extract 'initiate_incident' value from JSON (true/false)
-INITIATE_INCIDENT=$(echo "$HTTP_RESPONSE_BODY" | grep -o '"initiate_incident":[ ]*\(true\|false\)' | head -n1 | awk -F: '{gsub(/[ \t]/,"",$2); print $2}')
+# Extract 'initiate_incident' value from JSON (true/false) with a bash regex
+# rather than an echo | grep | head | awk pipeline
+INITIATE_INCIDENT=""
+if [[ "$HTTP_RESPONSE_BODY" =~ \"initiate_incident\"[[:space:]]*:[[:space:]]*(true|false) ]]; then
+    INITIATE_INCIDENT="${BASH_REMATCH[1]}"
+fi
 log "initiate_incident in response: $INITIATE_INCIDENT"
 
 if [[ "$INITIATE_INCIDENT" == "true" ]]; then
     log "initiate_incident is true! Updating cfg.json and notifying controller..."
 
-    # Update /coin-forge/cfg.json: set INITIATE_ATTACK to true
-    CFG_FILE="/coin-forge/cfg.json"
-    TMP_CFG=$(mktemp)
+    # Update cfg.json: set INITIATE_ATTACK to true
+    # Stage the edit next to cfg.json so the mv below is an atomic rename on
+    # the same filesystem rather than a copy from /tmp
+    TMP_CFG=$(mktemp "$CFG_FILE.XXXXXX")
 
     # Replace the value for INITIATE_ATTACK (whether true or false) with true
     # Handles both "INITIATE_ATTACK":false and "INITIATE_ATTACK": false
     sed 's/\("INITIATE_ATTACK"[ ]*:[ ]*\)false/\1true/' "$CFG_FILE" > "$TMP_CFG"
     mv "$TMP_CFG" "$CFG_FILE"
-    log "Updated /coin-forge/cfg.json: INITIATE_ATTACK set to true."
+    log "Updated $CFG_FILE: INITIATE_ATTACK set to true."
 
     # Notify controller via attack-initiated endpoint
     ATTACK_INITIATED_URL="http://$CONTROLLER_IP:5000/attack-initiated"
-    ATTACK_RESP=$(curl --silent --show-error --fail -X POST "$ATTACK_INITIATED_URL" -H "Content-Type: application/json" -d '{}' 2>>"$LOG_FILE" || echo "error")
+    ATTACK_RESP=$(curl --silent --show-error --fail -X POST "${CURL_TIMEOUTS[@]}" "$ATTACK_INITIATED_URL" -H "Content-Type: application/json" -d '{}' 2>>"$LOG_FILE" || echo "error")
     log "Sent POST to $ATTACK_INITIATED_URL. Response: $ATTACK_RESP"
 else
     log "initiate_incident is not true; nothing to do."